@@ -0,0 +1,167 @@
+# Serialization microbenchmark
+#
+# Measures the per-request CPU time of the ShortURL endpoints for each response
+# format, and compares the ORM serialization of the read endpoints with the
+# row-based one.
+#
+# Usage: python -m app.benchmarks.serialization_benchmark [iterations]
+
+# Imports
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+
+import orjson
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.pool import StaticPool
+
+from app.db.database import get_session
+from app.main import app
+from app.models.sql.shorturl import ShortURL
+from app.utils.shorturl.serializers import MSGPACK_MEDIA_TYPE, SHORTURL_COLUMNS, row_to_dict
+
+ROWS = 50
+LIMIT = 20
+DELETED_ID = "benchdl"
+
+# Functions
+
+
+def cpu_time_per_call(func, iterations: int, setup=None) -> float:
+    """
+    Returns the CPU time per call of func in microseconds, excluding the setup
+    called before each call
+    """
+    if setup is not None:
+        setup()
+    func()
+    elapsed = 0.0
+    for _ in range(iterations):
+        if setup is not None:
+            setup()
+        start = time.process_time()
+        func()
+        elapsed += time.process_time() - start
+    return elapsed / iterations * 1_000_000
+
+
+def seed(session: Session) -> str:
+    """
+    Inserts the benchmark rows and returns the id of the first one
+    """
+    for i in range(ROWS):
+        session.add(ShortURL(id=f"bench{i:02d}", url=f"https://www.example.com/{i}"))
+    session.commit()
+    return "bench00"
+
+
+def bench_endpoints(client: TestClient, engine, short_url_id: str, iterations: int):
+    """
+    Prints the CPU time per request of each endpoint and response format
+    """
+    expire_date = (datetime.now() + timedelta(days=30)).isoformat()
+
+    def seed_deleted():
+        with Session(engine) as session:
+            session.add(ShortURL(id=DELETED_ID, url="https://www.example.com/deleted"))
+            session.commit()
+
+    # (name, call, setup before each call)
+    endpoints = [
+        (
+            "POST /v1/shorturl/build",
+            lambda headers: client.post("/v1/shorturl/build", json={"url": "https://www.example.com"}, headers=headers),
+            None,
+        ),
+        ("GET /v1/shorturl/all", lambda headers: client.get(f"/v1/shorturl/all?limit={LIMIT}", headers=headers), None),
+        ("GET /v1/shorturl/{id}", lambda headers: client.get(f"/v1/shorturl/{short_url_id}", headers=headers), None),
+        ("GET /v1/shorturl/{id} (404)", lambda headers: client.get("/v1/shorturl/missing", headers=headers), None),
+        (
+            "GET /v1/{id}",
+            lambda headers: client.get(f"/v1/{short_url_id}", headers=headers, follow_redirects=False),
+            None,
+        ),
+        (
+            "PUT /v1/shorturl/{id}",
+            lambda headers: client.put(
+                f"/v1/shorturl/{short_url_id}", json={"url": "https://www.example.com/0"}, headers=headers
+            ),
+            None,
+        ),
+        (
+            "PATCH /v1/shorturl/{id}",
+            lambda headers: client.patch(
+                f"/v1/shorturl/{short_url_id}", params={"expire_date": expire_date}, headers=headers
+            ),
+            None,
+        ),
+        (
+            "DELETE /v1/shorturl/{id}",
+            lambda headers: client.delete(f"/v1/shorturl/{DELETED_ID}", headers=headers),
+            seed_deleted,
+        ),
+    ]
+    formats = [("json", {"accept": "application/json"}), ("msgpack", {"accept": MSGPACK_MEDIA_TYPE})]
+
+    print(f"{'endpoint':<32}" + "".join(f"{name + ' (us)':>16}" for name, _ in formats))
+    for name, call, setup in endpoints:
+        timings = [cpu_time_per_call(lambda: call(headers), iterations, setup) for _, headers in formats]
+        print(f"{name:<32}" + "".join(f"{timing:>16.1f}" for timing in timings))
+
+
+def bench_read_serialization(session: Session, short_url_id: str, iterations: int):
+    """
+    Prints the CPU time of the ORM and row serialization of the read endpoints
+    """
+
+    def details_orm():
+        short_url = session.exec(select(ShortURL).where(ShortURL.id == short_url_id)).first()
+        session.expunge_all()
+        return orjson.dumps({"data": short_url.model_dump()})
+
+    def details_rows():
+        row = session.exec(select(*SHORTURL_COLUMNS).where(ShortURL.id == short_url_id)).first()
+        return orjson.dumps({"data": row_to_dict(row)})
+
+    def all_orm():
+        results = session.exec(select(ShortURL).limit(LIMIT)).all()
+        session.expunge_all()
+        return orjson.dumps({"data": [short_url.model_dump() for short_url in results]})
+
+    def all_rows():
+        results = session.exec(select(*SHORTURL_COLUMNS).limit(LIMIT)).all()
+        return orjson.dumps({"data": [row_to_dict(row) for row in results]})
+
+    print(f"\n{'read serialization':<32}{'orm (us)':>16}{'rows (us)':>16}")
+    for name, orm, rows in [("details", details_orm, details_rows), (f"all (limit {LIMIT})", all_orm, all_rows)]:
+        print(f"{name:<32}{cpu_time_per_call(orm, iterations):>16.1f}{cpu_time_per_call(rows, iterations):>16.1f}")
+
+
+def main(iterations: int = 500):
+    # Request logging would dominate the timings
+    logging.disable(logging.CRITICAL)
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        short_url_id = seed(session)
+        bench_read_serialization(session, short_url_id, iterations)
+
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    try:
+        print()
+        bench_endpoints(TestClient(app), engine, short_url_id, iterations)
+    finally:
+        app.dependency_overrides.clear()
+
+
+# Main
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -1,6 +1,8 @@
 # Configuration file
 
 # Imports
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,4 +10,15 @@ class Settings(BaseSettings):
     app_name: str = "Short URL API"
     test_mode: bool
     db_uri: str = "sqlite:///database/database.sqlite"
+    url_cache_size: int = 10000
+    hot_set_path: str = "database/hot_set.json"
+    hot_set_size: int = 1000
+    hot_set_persist_interval: int = 300
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.01
+    profiling_interval_ms: float = 5
+    profiling_slow_threshold_ms: float = 500
+    profiling_dir: str = "database/profiles"
+    profiling_max_profiles: int = 100
+    admin_token: Optional[str] = None
     model_config = SettingsConfigDict(env_file=".env")
@@ -6,6 +6,7 @@ import os
 from sqlmodel import Session, create_engine
 
 from app.utils.get_settings import get_settings
+from app.utils.profiling.profiler import track_current_thread
 
 settings = get_settings()
 
@@ -16,5 +17,6 @@ engine = create_engine(settings.db_uri, echo=False)
 
 
 def get_session():
+    track_current_thread()
     with Session(engine) as session:
         yield session
@@ -1,8 +1,10 @@
 # ShortURL FastAPI Project
 
 # Imports
+import asyncio
 import logging
 import os
+from contextlib import asynccontextmanager, suppress
 
 import uvicorn
 from fastapi import FastAPI, status
@@ -10,15 +12,25 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import ORJSONResponse, RedirectResponse
+from fastapi.responses import RedirectResponse
 from sqlmodel import SQLModel
 
 # Database
 from app.db.database import engine
 
 # Routers
+from app.routes.admin.admin import AdminAccessError
+from app.routes.admin.admin import router as admin_router
+from app.routes.health.health import router as health_router
 from app.routes.shorturl.shorturl import router as shorturl_router
 
+# Utils
+from app.utils.get_settings import get_settings
+from app.utils.profiling.middleware import ProfilingMiddleware
+from app.utils.profiling.profiler import ProfileStore, enable_sql_timings
+from app.utils.shorturl.hot_set import persist_hot_set, persist_hot_set_periodically, warm_up
+from app.utils.shorturl.serializers import content_response, message_response
+
 # Logging
 logging.config.fileConfig(
     os.path.join(os.path.dirname(__file__), "config", "logging.conf"),
@@ -32,9 +44,34 @@ tags_metadata = [
     {
         "name": "ShortURL",
         "description": "ShortURL Endpoints",
-    }
+    },
+    {
+        "name": "Health",
+        "description": "Health Endpoints",
+    },
+    {
+        "name": "Admin",
+        "description": "Admin Endpoints",
+    },
 ]
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in background so the instance reports not ready until it finishes
+    warm_up_task = asyncio.create_task(asyncio.to_thread(warm_up))
+    persist_task = asyncio.create_task(persist_hot_set_periodically())
+    yield
+    persist_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await persist_task
+    await warm_up_task
+    try:
+        await asyncio.to_thread(persist_hot_set)
+    except Exception as exc:
+        logging.error(f"Hot set persistence failed: {exc}")
+
+
 app = FastAPI(
     title="FastAPI ShortURL",
     description="A ShortURL API built with FastAPI",
@@ -42,6 +79,7 @@ app = FastAPI(
     docs_url=None,
     redoc_url=None,
     openapi_url=None,
+    lifespan=lifespan,
 )
 
 origins = ["http://localhost:8080"]
@@ -54,8 +92,21 @@ app.add_middleware(
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
 )
 
+# Profiling
+settings = get_settings()
+if settings.profiling_enabled:
+    enable_sql_timings()
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=ProfileStore(settings.profiling_dir, settings.profiling_max_profiles),
+        sample_rate=settings.profiling_sample_rate,
+        slow_threshold_ms=settings.profiling_slow_threshold_ms,
+    )
+
 # Routers
 app.include_router(shorturl_router)
+app.include_router(health_router)
+app.include_router(admin_router)
 
 
 @app.get("/docs", include_in_schema=True, tags=["Docs"])
@@ -98,10 +149,13 @@ async def validation_exception_handler(request, exc):
     for error in exc.__dict__["_errors"]:
         errors_details.append({"msg": error["msg"], "loc": ".".join(error["loc"]), "type": error["type"]})
         logging.error(f"Validation error: {error}")
-    return ORJSONResponse(
-        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={"errors": errors_details},
-    )
+    return content_response(request, {"errors": errors_details}, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+# Admin access errors
+@app.exception_handler(AdminAccessError)
+async def admin_access_exception_handler(request, exc):
+    return message_response(request, exc.message, exc.status_code)
 
 
 # Main
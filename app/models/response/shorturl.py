@@ -0,0 +1,35 @@
+# Pydantic response models
+
+# Imports
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class MessageResponse(BaseModel):
+    message: str
+
+
+class ShortURLBuildResponse(MessageResponse):
+    short_url: str
+
+
+class ShortURLData(BaseModel):
+    id: str
+    url: str
+    visitors: Optional[int] = 0
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+
+class ShortURLDetailsResponse(BaseModel):
+    data: ShortURLData
+
+
+class ShortURLListResponse(BaseModel):
+    data: List[ShortURLData]
+    count: int
+    page: int
+    limit: int
@@ -0,0 +1,201 @@
+# Admin endpoints
+
+# Imports
+import logging
+import secrets
+from typing import Optional
+
+# FastAPI
+from fastapi import APIRouter, Depends, Header, Request, status
+from fastapi.responses import PlainTextResponse
+
+# Load settings
+from app.config.config import Settings
+from app.utils.get_settings import get_settings
+
+# Utils
+from app.utils.profiling.profiler import ProfileStore, stack_sampler, to_flamegraph
+from app.utils.shorturl.serializers import content_response, message_response
+
+
+class AdminAccessError(Exception):
+    """
+    Raised when an admin endpoint can not be accessed
+    """
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def verify_admin(
+    request: Request, settings: Settings = Depends(get_settings), x_admin_token: Optional[str] = Header(default=None)
+):
+    """
+    Checks that profiling is enabled and the admin token is valid
+    """
+    if not settings.profiling_enabled:
+        raise AdminAccessError("Profiling disabled", status.HTTP_404_NOT_FOUND)
+    if not settings.admin_token:
+        logging.error("Admin endpoints called without ADMIN_TOKEN configured")
+        raise AdminAccessError("Admin token not configured", status.HTTP_404_NOT_FOUND)
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token.encode(), settings.admin_token.encode()):
+        logging.error(f"Invalid admin token for {request.url.path}")
+        raise AdminAccessError("Invalid admin token", status.HTTP_401_UNAUTHORIZED)
+
+
+# Start Router
+router = APIRouter(prefix="/admin", dependencies=[Depends(verify_admin)])
+
+
+@router.get(
+    "/profiles",
+    status_code=status.HTTP_200_OK,
+    tags=["Admin"],
+    responses={
+        200: {
+            "description": "Successful Response",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "data": [
+                            {
+                                "id": "1710203168162936000-3f2a9c1d",
+                                "method": "GET",
+                                "path": "/v1/LTMGmJ3",
+                                "status_code": 302,
+                                "duration_ms": 812.345,
+                                "started_at": 1710203168.162936,
+                                "sampled": True,
+                                "sql_statements": 2,
+                            }
+                        ],
+                        "count": 1,
+                    }
+                }
+            },
+        },
+        401: {
+            "description": "Invalid admin token",
+            "content": {"application/json": {"example": {"message": "Invalid admin token"}}},
+        },
+        404: {
+            "description": "Profiling disabled",
+            "content": {"application/json": {"example": {"message": "Profiling disabled"}}},
+        },
+    },
+)
+def get_profiles(request: Request, settings: Settings = Depends(get_settings)):
+    """
+    Get the slow request profiles captured, newest first
+    """
+    profiles = ProfileStore(settings.profiling_dir, settings.profiling_max_profiles).list()
+
+    return content_response(request, {"data": profiles, "count": len(profiles)}, status.HTTP_200_OK)
+
+
+@router.get(
+    "/profiles/sampled/flamegraph",
+    status_code=status.HTTP_200_OK,
+    tags=["Admin"],
+    response_class=PlainTextResponse,
+    responses={
+        200: {
+            "description": "Collapsed stacks of the sampled requests",
+            "content": {"text/plain": {"example": "<module> (app/main.py:1);run (asyncio/runners.py:86) 3\n"}},
+        },
+        401: {
+            "description": "Invalid admin token",
+            "content": {"application/json": {"example": {"message": "Invalid admin token"}}},
+        },
+        404: {
+            "description": "Profiling disabled",
+            "content": {"application/json": {"example": {"message": "Profiling disabled"}}},
+        },
+    },
+)
+def get_sampled_flamegraph(request: Request, settings: Settings = Depends(get_settings)):
+    """
+    Get the aggregated stacks of the sampled requests in collapsed stack format
+    """
+    return PlainTextResponse(to_flamegraph(stack_sampler.snapshot()))
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    status_code=status.HTTP_200_OK,
+    tags=["Admin"],
+    responses={
+        200: {
+            "description": "Successful Response",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "data": {
+                            "id": "1710203168162936000-3f2a9c1d",
+                            "method": "GET",
+                            "path": "/v1/LTMGmJ3",
+                            "status_code": 302,
+                            "duration_ms": 812.345,
+                            "started_at": 1710203168.162936,
+                            "sampled": True,
+                            "stacks": {"redirect_shorturl (app/routes/shorturl/shorturl.py:169)": 3},
+                            "sql": [{"statement": "SELECT shorturl.id ...", "duration_ms": 0.412}],
+                        }
+                    }
+                }
+            },
+        },
+        401: {
+            "description": "Invalid admin token",
+            "content": {"application/json": {"example": {"message": "Invalid admin token"}}},
+        },
+        404: {
+            "description": "Profile not found",
+            "content": {"application/json": {"example": {"message": "Profile not found"}}},
+        },
+    },
+)
+def get_profile(profile_id: str, request: Request, settings: Settings = Depends(get_settings)):
+    """
+    Get a slow request profile with its stacks and SQL statement timings
+    """
+    profile = ProfileStore(settings.profiling_dir, settings.profiling_max_profiles).get(profile_id)
+    if profile is None:
+        logging.error(f"Profile {profile_id} not found")
+        return message_response(request, "Profile not found", status.HTTP_404_NOT_FOUND)
+
+    return content_response(request, {"data": profile}, status.HTTP_200_OK)
+
+
+@router.get(
+    "/profiles/{profile_id}/flamegraph",
+    status_code=status.HTTP_200_OK,
+    tags=["Admin"],
+    response_class=PlainTextResponse,
+    responses={
+        200: {
+            "description": "Collapsed stacks of the request",
+            "content": {"text/plain": {"example": "redirect_shorturl (app/routes/shorturl/shorturl.py:169) 3\n"}},
+        },
+        401: {
+            "description": "Invalid admin token",
+            "content": {"application/json": {"example": {"message": "Invalid admin token"}}},
+        },
+        404: {
+            "description": "Profile not found",
+            "content": {"application/json": {"example": {"message": "Profile not found"}}},
+        },
+    },
+)
+def get_profile_flamegraph(profile_id: str, request: Request, settings: Settings = Depends(get_settings)):
+    """
+    Get the stacks of a slow request profile in collapsed stack format
+    """
+    profile = ProfileStore(settings.profiling_dir, settings.profiling_max_profiles).get(profile_id)
+    if profile is None:
+        logging.error(f"Profile {profile_id} not found")
+        return message_response(request, "Profile not found", status.HTTP_404_NOT_FOUND)
+
+    return PlainTextResponse(to_flamegraph(profile["stacks"]))
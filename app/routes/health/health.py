@@ -0,0 +1,40 @@
+# Health endpoints
+
+# Imports
+
+# FastAPI
+from fastapi import APIRouter, Request, status
+
+# Utils
+from app.utils.shorturl.hot_set import warmup_state
+from app.utils.shorturl.serializers import content_response
+
+# Start Router
+router = APIRouter(prefix="/health")
+
+
+@router.get(
+    "/ready",
+    status_code=status.HTTP_200_OK,
+    tags=["Health"],
+    responses={
+        200: {
+            "description": "Instance warmed up and ready",
+            "content": {"application/json": {"example": {"status": "ready", "loaded": 1000}}},
+        },
+        503: {
+            "description": "Instance warming up",
+            "content": {"application/json": {"example": {"status": "warming_up", "loaded": 0}}},
+        },
+    },
+)
+async def get_readiness(request: Request):
+    """
+    Readiness of the instance, ready once the URL cache is warmed up
+    """
+    if not warmup_state.ready:
+        return content_response(
+            request, {"status": "warming_up", "loaded": warmup_state.loaded}, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    return content_response(request, {"status": "ready", "loaded": warmup_state.loaded}, status.HTTP_200_OK)
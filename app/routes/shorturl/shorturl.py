@@ -6,10 +6,10 @@ from datetime import datetime
 
 # FastAPI
 from fastapi import APIRouter, Depends, Request, status
-from fastapi.responses import ORJSONResponse, RedirectResponse
+from fastapi.responses import RedirectResponse
 
 # Database
-from sqlmodel import Session, select
+from sqlmodel import Session, select, update
 
 # Load settings
 from app.config.config import Settings
@@ -17,11 +17,27 @@ from app.db.database import get_session
 
 # Pydantic models
 from app.models.body.shorturl import ShortURLBody, ShortURLBuildBody
+from app.models.response.shorturl import (
+    MessageResponse,
+    ShortURLBuildResponse,
+    ShortURLDetailsResponse,
+    ShortURLListResponse,
+)
 from app.models.sql.shorturl import ShortURL
 from app.utils.get_settings import get_settings
 
+# Serializers
+from app.utils.shorturl.serializers import (
+    SHORTURL_COLUMNS,
+    content_response,
+    message_response,
+    row_to_dict,
+    shorturl_prefix,
+)
+
 # Utils
 from app.utils.shorturl.shorturl_tools import convert_long_url_short_id
+from app.utils.shorturl.url_cache import url_cache
 
 # Start Router
 router = APIRouter(prefix="/v1")
@@ -29,6 +45,7 @@ router = APIRouter(prefix="/v1")
 
 @router.post(
     "/shorturl/build",
+    response_model=ShortURLBuildResponse,
     status_code=status.HTTP_200_OK,
     tags=["ShortURL"],
     responses={
@@ -68,17 +85,19 @@ def build_shorturl(
     logging.info(f"ShortURL {short_url_id} created successfully")
     logging.info("Returning API status")
 
-    return ORJSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={
+    return content_response(
+        request,
+        {
             "message": "ShortURL created successfully",
-            "short_url": f"{request.base_url}{router.prefix[1:]}/{short_url_id}",
+            "short_url": f"{shorturl_prefix(request, router.prefix)}{short_url_id}",
         },
+        status.HTTP_200_OK,
     )
 
 
 @router.get(
     "/shorturl/all",
+    response_model=ShortURLListResponse,
     status_code=status.HTTP_200_OK,
     tags=["ShortURL"],
     responses={
@@ -123,12 +142,13 @@ def get_all_shorturl(
     logging.debug(f"Page: {page} Limit: {limit}")
 
     with session:
-        query = select(ShortURL).offset((page - 1) * limit).limit(limit)
+        query = select(*SHORTURL_COLUMNS).offset((page - 1) * limit).limit(limit)
         results = session.exec(query).all()
 
-    return ORJSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={"data": [short_url.model_dump() for short_url in results], "count": len(results), "page": page, "limit": limit},
+    return content_response(
+        request,
+        {"data": [row_to_dict(row) for row in results], "count": len(results), "page": page, "limit": limit},
+        status.HTTP_200_OK,
     )
 
 
@@ -152,25 +172,43 @@ def redirect_shorturl(short_url_id, request: Request, settings: Settings = Depen
     Redirect the existing short URL to the original URL and save last visitor
     """
 
-    # Get shorturl from database
-    logging.info(f"Getting ShortURL {short_url_id} from database")
-    with session:
-        query = select(ShortURL).where(ShortURL.id == short_url_id)
-        results = session.exec(query)
-        short_url = results.first()
-        if short_url is None:
-            logging.error(f"ShortURL {short_url_id} not found")
-            return ORJSONResponse(
-                status_code=status.HTTP_404_NOT_FOUND,
-                content={"message": "ShortURL not found"},
+    # Get original URL from cache, only updating visitors in database
+    # The update also matches the cached URL, so a deleted or changed shorturl falls back to the database
+    original_url = url_cache.get(short_url_id)
+    if original_url is not None:
+        logging.info(f"Getting ShortURL {short_url_id} from cache")
+        with session:
+            query = (
+                update(ShortURL)
+                .where(ShortURL.id == short_url_id, ShortURL.url == original_url)
+                .values(visitors=ShortURL.visitors + 1)
             )
+            results = session.exec(query)
+            session.commit()
+        if results.rowcount == 0:
+            url_cache.invalidate(short_url_id)
+            original_url = None
 
-        # Update visitors and get original URL
-        logging.info(f"Redirecting to original URL {short_url.url}")
-        short_url.visitors = short_url.visitors + 1
-        original_url = short_url.url
-        session.add(short_url)
-        session.commit()
+    # Get shorturl from database
+    if original_url is None:
+        logging.info(f"Getting ShortURL {short_url_id} from database")
+        with session:
+            query = select(ShortURL).where(ShortURL.id == short_url_id)
+            results = session.exec(query)
+            short_url = results.first()
+            if short_url is None:
+                logging.error(f"ShortURL {short_url_id} not found")
+                return message_response(request, "ShortURL not found", status.HTTP_404_NOT_FOUND)
+
+            # Update visitors and get original URL
+            short_url.visitors = short_url.visitors + 1
+            original_url = short_url.url
+            session.add(short_url)
+            session.commit()
+
+        url_cache.put(short_url_id, original_url)
+
+    logging.info(f"Redirecting to original URL {original_url}")
 
     logging.info("Returning API status")
 
@@ -180,6 +218,7 @@ def redirect_shorturl(short_url_id, request: Request, settings: Settings = Depen
 
 @router.get(
     "/shorturl/{short_url_id}",
+    response_model=ShortURLDetailsResponse,
     status_code=status.HTTP_200_OK,
     tags=["ShortURL"],
     responses={
@@ -214,36 +253,22 @@ def get_shorturl_details(short_url_id, request: Request, settings: Settings = De
     # Get shortURL from database
     logging.info(f"Getting shortURL{short_url_id} from database")
     with session:
-        query = select(ShortURL).where(ShortURL.id == short_url_id)
+        query = select(*SHORTURL_COLUMNS).where(ShortURL.id == short_url_id)
         results = session.exec(query)
-        short_url = results.first()
-        if short_url is None:
+        row = results.first()
+        if row is None:
             logging.error(f"ShortURL {short_url_id} not found")
-            return ORJSONResponse(
-                status_code=status.HTTP_404_NOT_FOUND,
-                content={"message": "shortURL not found"},
-            )
+            return message_response(request, "shortURL not found", status.HTTP_404_NOT_FOUND)
 
-        logging.info(f"Returning shortURL {short_url_id} stats")
-        logging.info("Returning API status")
+    logging.info(f"Returning shortURL {short_url_id} stats")
+    logging.info("Returning API status")
 
-        return ORJSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "data": {
-                    "id": short_url.id,
-                    "url": short_url.url,
-                    "visitors": short_url.visitors,
-                    "created_at": short_url.created_at,
-                    "updated_at": short_url.updated_at,
-                    "expires_at": short_url.expires_at,
-                }
-            },
-        )
+    return content_response(request, {"data": row_to_dict(row)}, status.HTTP_200_OK)
 
 
 @router.delete(
     "/shorturl/{short_url_id}",
+    response_model=MessageResponse,
     status_code=status.HTTP_200_OK,
     tags=["ShortURL"],
     responses={
@@ -270,27 +295,23 @@ def delete_shorturl(short_url_id, request: Request, settings: Settings = Depends
         short_url = results.first()
         if short_url is None:
             logging.error(f"ShortURL {short_url_id} not found")
-            return ORJSONResponse(
-                status_code=status.HTTP_404_NOT_FOUND,
-                content={"message": "ShortURL not found"},
-            )
+            return message_response(request, "ShortURL not found", status.HTTP_404_NOT_FOUND)
 
         # Delete shortURL
         logging.info(f"Deleting shortURL {short_url_id} from database")
         session.delete(short_url)
         session.commit()
+        url_cache.invalidate(short_url_id)
 
         logging.info(f"ShortURL {short_url_id} deleted successfully")
         logging.info("Returning API status")
 
-    return ORJSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={"message": "ShortURL deleted successfully"},
-    )
+    return message_response(request, "ShortURL deleted successfully", status.HTTP_200_OK)
 
 
 @router.put(
     "/shorturl/{short_url_id}",
+    response_model=MessageResponse,
     status_code=status.HTTP_200_OK,
     tags=["ShortURL"],
     responses={
@@ -320,10 +341,7 @@ def update_shorturl(
         short_url = results.first()
         if short_url is None:
             logging.error(f"ShortURL {short_url_id} not found")
-            return ORJSONResponse(
-                status_code=status.HTTP_404_NOT_FOUND,
-                content={"message": "ShortURL not found"},
-            )
+            return message_response(request, "ShortURL not found", status.HTTP_404_NOT_FOUND)
 
         # Update with parameters
         logging.info(f"Updating shortURL {short_url_id} with new parameters")
@@ -338,18 +356,17 @@ def update_shorturl(
 
         session.add(short_url)
         session.commit()
+        url_cache.invalidate(short_url_id)
 
         logging.info(f"ShortURL {short_url_id} updated successfully")
         logging.info("Returning API status")
 
-    return ORJSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={"message": "ShortURL updated"},
-    )
+    return message_response(request, "ShortURL updated", status.HTTP_200_OK)
 
 
 @router.patch(
     "/shorturl/{short_url_id}",
+    response_model=MessageResponse,
     status_code=status.HTTP_200_OK,
     tags=["ShortURL"],
     responses={
@@ -373,16 +390,10 @@ def update_expire_date_shorturl(
     # Check expire date
     if expire_date is None or expire_date == "":
         logging.error("Expire date is empty")
-        return ORJSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": "Expire date is empty"},
-        )
+        return message_response(request, "Expire date is empty", status.HTTP_400_BAD_REQUEST)
     if expire_date < datetime.now():
         logging.error(f"Expire date {expire_date} is in the past")
-        return ORJSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": "Expire date is in the past"},
-        )
+        return message_response(request, "Expire date is in the past", status.HTTP_400_BAD_REQUEST)
 
     # Get shorturl from database
     logging.info(f"Getting shortURL {short_url_id} from database")
@@ -392,10 +403,7 @@ def update_expire_date_shorturl(
         short_url = results.first()
         if short_url is None:
             logging.error(f"ShortURL {short_url_id} not found")
-            return ORJSONResponse(
-                status_code=status.HTTP_404_NOT_FOUND,
-                content={"message": "ShortURL not found"},
-            )
+            return message_response(request, "ShortURL not found", status.HTTP_404_NOT_FOUND)
 
         # Update with parameters
         logging.info(f"Updating shortURL {short_url_id} with new expire date")
@@ -408,7 +416,4 @@ def update_expire_date_shorturl(
         logging.info(f"ShortURL {short_url_id} expire date updated successfully")
         logging.info("Returning API status")
 
-    return ORJSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={"message": "ShortURL expire date updated"},
-    )
+    return message_response(request, "ShortURL expire date updated", status.HTTP_200_OK)
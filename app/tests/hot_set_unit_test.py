@@ -0,0 +1,139 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine, update
+from sqlmodel.pool import StaticPool
+
+from app.db.database import get_session
+from app.main import app
+from app.models.sql.shorturl import ShortURL
+from app.utils.get_settings import get_settings
+from app.utils.shorturl import hot_set
+from app.utils.shorturl.hot_set import load_hot_set, save_hot_set, warmup_state
+from app.utils.shorturl.url_cache import URLCache, url_cache
+
+TEST_DATABASE_URL = "sqlite:///./test.sqlite"
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        TEST_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool, echo=True
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(ShortURL(id="hot0001", url="https://www.google.com", visitors=10))
+        session.add(ShortURL(id="hot0002", url="https://twitter.com/home", visitors=5))
+        session.add(ShortURL(id="cold001", url="https://www.example.com", visitors=0))
+        session.commit()
+        yield session
+    SQLModel.metadata.drop_all(engine)
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    def get_session_override():
+        return session
+
+    app.dependency_overrides[get_session] = get_session_override
+    url_cache.clear()
+
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
+    url_cache.clear()
+
+
+def test_hot_set_round_trip(session: Session, tmp_path):
+    path = str(tmp_path / "hot_set.json")
+    assert save_hot_set(session, path, 2) == 2
+
+    cache = URLCache(10)
+    assert load_hot_set(session, path, cache) == 2
+    assert cache.get("hot0001") == "https://www.google.com"
+    assert cache.get("hot0002") == "https://twitter.com/home"
+    assert cache.get("cold001") is None
+
+
+def test_hot_set_missing_file(session: Session, tmp_path):
+    cache = URLCache(10)
+    assert load_hot_set(session, str(tmp_path / "missing.json"), cache) == 0
+    assert len(cache) == 0
+
+
+def test_url_cache_evicts_least_recently_used():
+    cache = URLCache(2)
+    cache.put("a", "https://a.com")
+    cache.put("b", "https://b.com")
+    cache.get("a")
+    cache.put("c", "https://c.com")
+    assert cache.get("a") == "https://a.com"
+    assert cache.get("b") is None
+    assert cache.get("c") == "https://c.com"
+
+
+def test_redirect_from_cache_counts_visitor(client: TestClient, session: Session):
+    url_cache.put("hot0001", "https://www.google.com")
+    response = client.get("/v1/hot0001", follow_redirects=False)
+    assert response.status_code == 302
+    assert response.headers["location"] == "https://www.google.com"
+    assert client.get("/v1/shorturl/hot0001").json()["data"]["visitors"] == 11
+
+
+def test_redirect_after_delete(client: TestClient):
+    assert client.get("/v1/hot0002", follow_redirects=False).status_code == 302
+    assert url_cache.get("hot0002") == "https://twitter.com/home"
+    assert client.delete("/v1/shorturl/hot0002").status_code == 200
+    assert url_cache.get("hot0002") is None
+    assert client.get("/v1/hot0002", follow_redirects=False).status_code == 404
+
+
+def test_readiness(client: TestClient, monkeypatch):
+    monkeypatch.setattr(warmup_state, "ready", False)
+    assert client.get("/health/ready").status_code == 503
+    monkeypatch.setattr(warmup_state, "ready", True)
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_lifespan_warm_up(session: Session, tmp_path, monkeypatch):
+    path = str(tmp_path / "hot_set.json")
+    save_hot_set(session, path, 2)
+
+    monkeypatch.setattr(get_settings(), "hot_set_path", path)
+    monkeypatch.setattr(hot_set, "engine", create_engine(TEST_DATABASE_URL))
+    monkeypatch.setattr(warmup_state, "ready", False)
+    monkeypatch.setattr(warmup_state, "loaded", 0)
+    url_cache.clear()
+
+    try:
+        with TestClient(app) as client:
+            # Warm-up runs in background, so wait for the instance to become ready
+            deadline = time.monotonic() + 5
+            while client.get("/health/ready").status_code == 503 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            response = client.get("/health/ready")
+            assert response.status_code == 200
+            assert response.json() == {"status": "ready", "loaded": 2}
+            assert url_cache.get("hot0001") == "https://www.google.com"
+            assert url_cache.get("hot0002") == "https://twitter.com/home"
+            assert url_cache.get("cold001") is None
+    finally:
+        url_cache.clear()
+
+
+def test_redirect_after_url_changed_outside(client: TestClient, session: Session):
+    assert client.get("/v1/hot0001", follow_redirects=False).headers["location"] == "https://www.google.com"
+
+    # Change the URL as another instance would, without invalidating this cache
+    session.exec(update(ShortURL).where(ShortURL.id == "hot0001").values(url="https://new.example.com"))
+    session.commit()
+
+    response = client.get("/v1/hot0001", follow_redirects=False)
+    assert response.status_code == 302
+    assert response.headers["location"] == "https://new.example.com"
+    assert url_cache.get("hot0001") == "https://new.example.com"
+    assert client.get("/v1/shorturl/hot0001").json()["data"]["visitors"] == 12
@@ -0,0 +1,205 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+from app.config.config import Settings
+from app.db.database import get_session
+from app.main import app
+from app.models.sql.shorturl import ShortURL
+from app.routes.admin.admin import router as admin_router
+from app.routes.shorturl import shorturl as shorturl_routes
+from app.utils.get_settings import get_settings
+from app.utils.profiling.middleware import ProfilingMiddleware
+from app.utils.profiling.profiler import ProfileStore, RequestProfile, StackSampler, enable_sql_timings, to_flamegraph
+
+TEST_DATABASE_URL = "sqlite:///./test.sqlite"
+ADMIN_TOKEN = "test-admin-token"
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        TEST_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool, echo=True
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(ShortURL(id="LTMGmJ3", url="https://twitter.com/home"))
+        session.commit()
+        yield session
+    SQLModel.metadata.drop_all(engine)
+
+
+@pytest.fixture(name="settings")
+def settings_fixture(tmp_path):
+    return Settings(
+        test_mode=True,
+        profiling_enabled=True,
+        profiling_dir=str(tmp_path),
+        profiling_max_profiles=2,
+        admin_token=ADMIN_TOKEN,
+    )
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session, settings: Settings):
+    def get_session_override():
+        return session
+
+    def get_settings_override():
+        return settings
+
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_settings] = get_settings_override
+    enable_sql_timings()
+
+    # Profile every request and capture all of them as slow
+    store = ProfileStore(settings.profiling_dir, settings.profiling_max_profiles)
+    client = TestClient(
+        ProfilingMiddleware(app, store=store, sample_rate=1.0, slow_threshold_ms=0, sampler=StackSampler(0.001)),
+        headers={"x-admin-token": ADMIN_TOKEN},
+    )
+    yield client
+    app.dependency_overrides.clear()
+
+
+def test_slow_request_captured(client: TestClient):
+    assert client.get("/v1/shorturl/LTMGmJ3").status_code == 200
+
+    response = client.get("/admin/profiles")
+    assert response.status_code == 200
+    profile = response.json()["data"][0]
+    assert profile["path"] == "/v1/shorturl/LTMGmJ3"
+    assert profile["status_code"] == 200
+    assert profile["sampled"] is True
+    assert profile["sql_statements"] > 0
+
+    response = client.get(f"/admin/profiles/{profile['id']}")
+    assert response.status_code == 200
+    assert "shorturl" in response.json()["data"]["sql"][0]["statement"]
+
+    response = client.get(f"/admin/profiles/{profile['id']}/flamegraph")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+
+def test_slow_request_stacks_without_sampling(session: Session, settings: Settings, monkeypatch):
+    def get_session_override():
+        return session
+
+    def slow_row_to_dict(row):
+        time.sleep(0.05)
+        return row._asdict()
+
+    app.dependency_overrides[get_session] = get_session_override
+    monkeypatch.setattr(shorturl_routes, "row_to_dict", slow_row_to_dict)
+    store = ProfileStore(settings.profiling_dir, settings.profiling_max_profiles)
+    sampler = StackSampler(0.001)
+    client = TestClient(ProfilingMiddleware(app, store=store, sample_rate=0.0, slow_threshold_ms=0, sampler=sampler))
+    try:
+        assert client.get("/v1/shorturl/LTMGmJ3").status_code == 200
+    finally:
+        app.dependency_overrides.clear()
+
+    profile = store.get(store.ids()[-1])
+    assert profile["sampled"] is False
+    assert any("get_shorturl_details (" in stack for stack in profile["stacks"])
+    assert not sampler.aggregate
+
+
+def test_profile_ring_is_bounded(client: TestClient, settings: Settings):
+    for _ in range(4):
+        client.get("/v1/shorturl/LTMGmJ3")
+    assert len(ProfileStore(settings.profiling_dir, settings.profiling_max_profiles).ids()) == 2
+
+
+def test_profile_not_found(client: TestClient):
+    assert client.get("/admin/profiles/1-abc").status_code == 404
+    assert client.get("/admin/profiles/..%2Fdatabase").status_code == 404
+
+
+def test_profiling_disabled(client: TestClient, settings: Settings):
+    settings.profiling_enabled = False
+    response = client.get("/admin/profiles")
+    assert response.status_code == 404
+    assert response.json()["message"] == "Profiling disabled"
+
+
+def test_admin_invalid_token(client: TestClient):
+    response = client.get("/admin/profiles", headers={"x-admin-token": "wrong"})
+    assert response.status_code == 401
+    assert response.json()["message"] == "Invalid admin token"
+    del client.headers["x-admin-token"]
+    assert client.get("/admin/profiles/sampled/flamegraph").status_code == 401
+
+
+def test_admin_routes_require_token(client: TestClient):
+    del client.headers["x-admin-token"]
+    for route in admin_router.routes:
+        response = client.get(route.path.replace("{profile_id}", "1-abc"))
+        assert response.status_code == 401, route.path
+        assert response.json() == {"message": "Invalid admin token"}
+
+
+def test_admin_token_not_configured(client: TestClient, settings: Settings):
+    settings.admin_token = None
+    response = client.get("/admin/profiles")
+    assert response.status_code == 404
+    assert response.json()["message"] == "Admin token not configured"
+
+
+def test_profile_store_round_trip(tmp_path):
+    profile = RequestProfile("GET", "/v1/LTMGmJ3", True)
+    profile.stacks["main (app.py:1);handler (app.py:10)"] = 3
+    store = ProfileStore(str(tmp_path), 10)
+    store.save(profile)
+    assert store.get(profile.id)["stacks"] == {"main (app.py:1);handler (app.py:10)": 3}
+
+
+def test_profile_store_skips_unreadable_files(tmp_path):
+    store = ProfileStore(str(tmp_path), 10)
+    profile = RequestProfile("GET", "/v1/LTMGmJ3", False)
+    store.save(profile)
+    (tmp_path / "1-abc.json").write_bytes(b"")
+
+    assert store.get("1-abc") is None
+    assert [saved["id"] for saved in store.list()] == [profile.id]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_sampler_snapshot():
+    sampler = StackSampler(0.001)
+    profile = RequestProfile("GET", "/v1/LTMGmJ3", True)
+    profile.stacks["a;b"] = 3
+    sampler.start(profile)
+    sampler.stop(profile)
+
+    snapshot = sampler.snapshot()
+    assert snapshot == {"a;b": 3}
+    snapshot["a;c"] = 1
+    assert sampler.snapshot() == {"a;b": 3}
+
+
+def test_to_flamegraph_format():
+    assert to_flamegraph({"a;b": 3}) == "a;b 3\n"
+    assert to_flamegraph({"a;b": 3, "a;c": 1}) == "a;b 3\na;c 1\n"
+
+
+def test_slow_request_flamegraph(client: TestClient, monkeypatch):
+    # Make the handler slow enough to be sampled several times
+    row_to_dict = shorturl_routes.row_to_dict
+
+    def slow_row_to_dict(row):
+        time.sleep(0.05)
+        return row_to_dict(row)
+
+    monkeypatch.setattr(shorturl_routes, "row_to_dict", slow_row_to_dict)
+    assert client.get("/v1/shorturl/LTMGmJ3").status_code == 200
+
+    profile = client.get("/admin/profiles").json()["data"][0]
+    response = client.get(f"/admin/profiles/{profile['id']}/flamegraph")
+    assert response.status_code == 200
+    assert "get_shorturl_details (" in response.text
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in response.text.splitlines())
@@ -0,0 +1,112 @@
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+from app.db.database import get_session
+from app.main import app
+from app.models.sql.shorturl import ShortURL
+from app.utils.shorturl.serializers import MSGPACK_MEDIA_TYPE
+
+TEST_DATABASE_URL = "sqlite:///./test.sqlite"
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine(
+        TEST_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool, echo=True
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(ShortURL(id="LTMGmJ3", url="https://twitter.com/home"))
+        session.commit()
+        yield session
+    SQLModel.metadata.drop_all(engine)
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    def get_session_override():
+        return session
+
+    app.dependency_overrides[get_session] = get_session_override
+
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
+
+
+def test_details_json(client: TestClient):
+    response = client.get("/v1/shorturl/LTMGmJ3")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["data"]["id"] == "LTMGmJ3"
+    assert response.json()["data"]["url"] == "https://twitter.com/home"
+    assert response.json()["data"]["visitors"] == 0
+
+
+def test_details_msgpack(client: TestClient):
+    response = client.get("/v1/shorturl/LTMGmJ3", headers={"accept": MSGPACK_MEDIA_TYPE})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    data = msgpack.unpackb(response.content)["data"]
+    assert data == client.get("/v1/shorturl/LTMGmJ3").json()["data"]
+
+
+def test_details_not_found_msgpack(client: TestClient):
+    response = client.get("/v1/shorturl/missing", headers={"accept": MSGPACK_MEDIA_TYPE})
+    assert response.status_code == 404
+    assert msgpack.unpackb(response.content) == {"message": "shortURL not found"}
+
+
+def test_all_rows(client: TestClient):
+    response = client.get("/v1/shorturl/all")
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    assert response.json()["data"][0]["id"] == "LTMGmJ3"
+    assert set(response.json()["data"][0]) == {"id", "url", "visitors", "created_at", "updated_at", "expires_at"}
+
+
+def test_build_short_url(client: TestClient):
+    response = client.post("/v1/shorturl/build", json={"url": "https://www.google.com"})
+    assert response.status_code == 200
+    assert response.json()["short_url"].startswith("http://testserver/v1/")
+    assert len(response.json()["short_url"]) == len("http://testserver/v1/") + 7
+
+
+@pytest.mark.parametrize(
+    "accept, media_type",
+    [
+        ("application/x-msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack;q=0.5, */*;q=0.1", MSGPACK_MEDIA_TYPE),
+        ("application/json, application/x-msgpack;q=0", "application/json"),
+        ("application/x-msgpack;q=0.5, application/json;q=0.9", "application/json"),
+        ("application/json;q=0.5, application/x-msgpack;q=0.9", MSGPACK_MEDIA_TYPE),
+        ("application/json, application/x-msgpack", "application/json"),
+        ("application/x-msgpack, application/json", MSGPACK_MEDIA_TYPE),
+        ("Application/X-Msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/x-msgpack;q=0.5, */*", "application/json"),
+        ("application/x-msgpack;q=0.5, application/*", "application/json"),
+        ("application/x-msgpack, */*", MSGPACK_MEDIA_TYPE),
+        ("application/x-msgpack;q=0.5, application/json;q=0.1, */*", MSGPACK_MEDIA_TYPE),
+    ],
+)
+def test_accept_negotiation(client: TestClient, accept: str, media_type: str):
+    response = client.get("/v1/shorturl/LTMGmJ3", headers={"accept": accept})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == media_type
+
+
+def test_validation_error_msgpack(client: TestClient):
+    response = client.post("/v1/shorturl/build", json={"url": "w.google"}, headers={"accept": MSGPACK_MEDIA_TYPE})
+    assert response.status_code == 422
+    assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    assert msgpack.unpackb(response.content)["errors"][0]["loc"] == "body.url"
+
+
+def test_build_short_url_host(client: TestClient):
+    response = client.post("/v1/shorturl/build", json={"url": "https://www.google.com"}, headers={"host": "sho.rt"})
+    assert response.json()["short_url"].startswith("http://sho.rt/v1/")
+    response = client.post("/v1/shorturl/build", json={"url": "https://www.google.com"})
+    assert response.json()["short_url"].startswith("http://testserver/v1/")
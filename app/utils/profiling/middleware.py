@@ -0,0 +1,65 @@
+# Request profiling middleware
+
+# Imports
+import asyncio
+import logging
+import random
+import sys
+import time
+
+from app.utils.profiling.profiler import ProfileStore, RequestProfile, StackSampler, current_profile, stack_sampler
+
+
+class ProfilingMiddleware:
+    """
+    Samples the stacks of every request in flight, and saves the profile of every
+    request slower than the threshold in the profile store. A fraction of the
+    requests is also added to the aggregated stacks of the sampler
+    """
+
+    def __init__(
+        self,
+        app,
+        store: ProfileStore,
+        sample_rate: float,
+        slow_threshold_ms: float,
+        sampler: StackSampler = stack_sampler,
+    ):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.sampler = sampler
+
+    async def __call__(self, scope, receive, send):
+        # Admin requests are skipped so reading the profiles never evicts them
+        if scope["type"] != "http" or scope["path"].startswith("/admin"):
+            await self.app(scope, receive, send)
+            return
+
+        sampled = random.random() < self.sample_rate
+        profile = RequestProfile(scope["method"], scope["path"], sampled)
+        profile.loop_frame = sys._getframe()
+        token = current_profile.set(profile)
+        self.sampler.start(profile)
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            profile.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+            self.sampler.stop(profile)
+            profile.loop_frame = None
+            current_profile.reset(token)
+
+            if profile.duration_ms >= self.slow_threshold_ms:
+                logging.warning(f"Slow request {profile.method} {profile.path} took {profile.duration_ms} ms")
+                try:
+                    await asyncio.to_thread(self.store.save, profile)
+                except OSError as exc:
+                    logging.error(f"Saving profile {profile.id} failed: {exc}")
@@ -0,0 +1,252 @@
+# Request profiler: stack sampling, SQL timings and slow request ring
+
+# Imports
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.get_settings import get_settings
+
+# Profile of the request being handled, propagated to the threadpool by the context
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+PROFILE_ID_REGEX = re.compile(r"[0-9]+-[0-9a-f]+")
+
+# Leaf frames (file, function) of a worker thread waiting for work
+IDLE_FRAMES = {("queue.py", "get"), ("selectors.py", "select")}
+
+
+class RequestProfile:
+    """
+    Stack samples and SQL statement timings of a single request, sampled if it
+    is added to the aggregated stacks
+    """
+
+    def __init__(self, method: str, path: str, sampled: bool):
+        self.id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+        self.method = method
+        self.path = path
+        self.sampled = sampled
+        self.started_at = time.time()
+        self.status_code = None
+        self.duration_ms = None
+        self.loop_thread = threading.get_ident()
+        self.loop_frame = None
+        self.threads = set()
+        self.stacks = Counter()
+        self.sql = []
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "duration_ms": self.duration_ms,
+            "started_at": self.started_at,
+            "sampled": self.sampled,
+            "stacks": dict(self.stacks),
+            "sql": self.sql,
+        }
+
+
+class StackSampler:
+    """
+    Background thread sampling the stacks of the threads handling the requests in flight,
+    aggregating the stacks of the sampled ones
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.aggregate = Counter()
+        self._profiles = set()
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._thread = None
+
+    def start(self, profile: RequestProfile):
+        with self._lock:
+            self._profiles.add(profile)
+            self._active.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+
+    def stop(self, profile: RequestProfile):
+        with self._lock:
+            self._profiles.discard(profile)
+            if not self._profiles:
+                self._active.clear()
+            if profile.sampled:
+                self.aggregate.update(profile.stacks)
+
+    def snapshot(self) -> Counter:
+        """
+        Returns a copy of the aggregated stacks, safe to iterate while sampling
+        """
+        with self._lock:
+            return self.aggregate.copy()
+
+    def _run(self):
+        while True:
+            self._active.wait()
+            frames = sys._current_frames()
+            with self._lock:
+                for profile in self._profiles:
+                    # The event loop is shared by every request, only sample it while it runs this one
+                    frame = frames.get(profile.loop_thread)
+                    if frame is not None and is_running(frame, profile.loop_frame):
+                        profile.stacks[collapse_stack(frame)] += 1
+                    for thread_id in list(profile.threads):
+                        frame = frames.get(thread_id)
+                        if frame is not None and not is_idle(frame):
+                            profile.stacks[collapse_stack(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+class ProfileStore:
+    """
+    Bounded on-disk ring of slow request profiles, one JSON file per profile
+    """
+
+    def __init__(self, path: str, max_profiles: int):
+        self.path = path
+        self.max_profiles = max_profiles
+
+    def _file(self, profile_id: str) -> str:
+        return os.path.join(self.path, f"{profile_id}.json")
+
+    def ids(self) -> List[str]:
+        if not os.path.isdir(self.path):
+            return []
+        # Ids start with the capture time, so names sort oldest first
+        return sorted(name[:-5] for name in os.listdir(self.path) if name.endswith(".json"))
+
+    def save(self, profile: RequestProfile):
+        # Write to a temporary file first so readers never see a partial profile
+        os.makedirs(self.path, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.path, prefix=f"{profile.id}.", suffix=".tmp", delete=False) as file:
+            file.write(orjson.dumps(profile.to_dict()))
+        os.replace(file.name, self._file(profile.id))
+
+        for profile_id in self.ids()[: -self.max_profiles]:
+            try:
+                os.remove(self._file(profile_id))
+            except FileNotFoundError:
+                pass
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        if not PROFILE_ID_REGEX.fullmatch(profile_id):
+            return None
+        try:
+            with open(self._file(profile_id), "rb") as file:
+                return orjson.loads(file.read())
+        except (OSError, orjson.JSONDecodeError):
+            # Evicted while reading, or not a valid profile
+            return None
+
+    def list(self) -> List[dict]:
+        profiles = []
+        for profile_id in reversed(self.ids()):
+            profile = self.get(profile_id)
+            if profile is not None:
+                profile.pop("stacks")
+                profile["sql_statements"] = len(profile.pop("sql"))
+                profiles.append(profile)
+        return profiles
+
+
+# Functions
+
+
+def collapse_stack(frame) -> str:
+    """
+    Formats a frame stack as a collapsed stack line, root frame first
+    """
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def is_running(frame, target) -> bool:
+    """
+    Checks if the target frame is in the stack, meaning its coroutine is running
+    """
+    while frame is not None:
+        if frame is target:
+            return True
+        frame = frame.f_back
+    return False
+
+
+def is_idle(frame) -> bool:
+    """
+    Checks if a worker thread is waiting for work
+    """
+    for _ in range(2):
+        code = frame.f_code
+        if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+            return True
+        frame = frame.f_back
+        if frame is None:
+            return False
+    return False
+
+
+def to_flamegraph(stacks: dict) -> str:
+    """
+    Formats collapsed stacks counts in the flamegraph.pl / speedscope input format
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.items())
+
+
+def track_current_thread():
+    """
+    Adds the current worker thread to the profile of the request, if any
+    """
+    profile = current_profile.get()
+    if profile is not None and profile.loop_thread != threading.get_ident():
+        profile.threads.add(threading.get_ident())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_profile.get() is not None:
+        # The endpoint may run in another worker thread than the get_session dependency
+        track_current_thread()
+        conn.info.setdefault("profiling_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    if profile is not None and conn.info.get("profiling_start"):
+        duration_ms = (time.perf_counter() - conn.info["profiling_start"].pop()) * 1000
+        profile.sql.append({"statement": statement, "duration_ms": round(duration_ms, 3)})
+
+
+def enable_sql_timings():
+    """
+    Records the SQL statements timings of the profiled requests, for every engine
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        logging.info("SQL statement timings enabled for profiling")
+
+
+stack_sampler = StackSampler(get_settings().profiling_interval_ms / 1000)
@@ -0,0 +1,108 @@
+# ShortURL hot set persistence and warm-up
+
+# Imports
+import asyncio
+import logging
+import os
+import tempfile
+
+import orjson
+from sqlmodel import Session, select
+
+from app.db.database import engine
+from app.models.sql.shorturl import ShortURL
+from app.utils.get_settings import get_settings
+from app.utils.shorturl.url_cache import URLCache, url_cache
+
+
+class WarmupState:
+    """
+    Warm-up progress of the instance, reported by the readiness endpoint
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.loaded = 0
+
+
+warmup_state = WarmupState()
+
+# Functions
+
+
+def save_hot_set(session: Session, path: str, size: int) -> int:
+    """
+    Persists the ids of the most visited shortURLs and returns how many were saved
+    """
+    query = select(ShortURL.id).order_by(ShortURL.visitors.desc()).limit(size)
+    ids = session.exec(query).all()
+
+    # Write to a unique temporary file first so a crash never leaves a truncated hot set,
+    # and a periodic save still running in its thread at shutdown never shares it
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=f"{os.path.basename(path)}.", delete=False) as file:
+        file.write(orjson.dumps(ids))
+    os.replace(file.name, path)
+
+    logging.debug(f"Saved {len(ids)} shortURLs in hot set {path}")
+    return len(ids)
+
+
+def load_hot_set(session: Session, path: str, cache: URLCache) -> int:
+    """
+    Loads the shortURLs of the persisted hot set into the cache and returns how many were loaded
+    """
+    if not os.path.exists(path):
+        logging.info(f"Hot set {path} not found, starting cold")
+        return 0
+
+    with open(path, "rb") as file:
+        ids = orjson.loads(file.read())[: cache.maxsize]
+
+    if not ids:
+        return 0
+
+    query = select(ShortURL.id, ShortURL.url).where(ShortURL.id.in_(ids))
+    rows = session.exec(query).all()
+    cache.put_many((row.id, row.url) for row in rows)
+
+    logging.debug(f"Loaded {len(rows)} shortURLs from hot set {path}")
+    return len(rows)
+
+
+def persist_hot_set():
+    """
+    Persists the hot set with the configured path and size
+    """
+    settings = get_settings()
+    with Session(engine) as session:
+        return save_hot_set(session, settings.hot_set_path, settings.hot_set_size)
+
+
+def warm_up():
+    """
+    Warms up the URL cache from the persisted hot set and marks the instance ready
+    """
+    settings = get_settings()
+    try:
+        with Session(engine) as session:
+            warmup_state.loaded = load_hot_set(session, settings.hot_set_path, url_cache)
+        logging.info(f"Warm-up finished with {warmup_state.loaded} shortURLs loaded")
+    except Exception as exc:
+        # A cold instance is still able to serve every request
+        logging.error(f"Warm-up failed: {exc}")
+    warmup_state.ready = True
+
+
+async def persist_hot_set_periodically():
+    """
+    Persists the hot set every configured interval
+    """
+    interval = get_settings().hot_set_persist_interval
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(persist_hot_set)
+        except Exception as exc:
+            logging.error(f"Hot set persistence failed: {exc}")
@@ -0,0 +1,158 @@
+# ShortURL response serializers
+
+# Imports
+from datetime import datetime
+from functools import lru_cache
+
+import msgpack
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.models.sql.shorturl import ShortURL
+
+# Media types
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/msgpack", "application/vnd.msgpack")
+WILDCARD_MEDIA_TYPES = ("*/*", "application/*")
+
+# Columns selected by the read endpoints, in response order
+SHORTURL_COLUMNS = (
+    ShortURL.id,
+    ShortURL.url,
+    ShortURL.visitors,
+    ShortURL.created_at,
+    ShortURL.updated_at,
+    ShortURL.expires_at,
+)
+
+# Memoized short URL prefixes by request origin
+SHORTURL_PREFIXES_SIZE = 32
+_shorturl_prefixes = {}
+
+# Functions
+
+
+def _msgpack_default(value):
+    """
+    Encodes values msgpack does not support natively, matching orjson output
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Type is not msgpack serializable: {type(value)}")
+
+
+@lru_cache(maxsize=64)
+def _parse_accept(accept: str) -> str:
+    """
+    Returns the response media type for an Accept header, preferring JSON unless
+    msgpack has a higher quality or the same quality and comes first.
+    Wildcards count as JSON when the header does not list JSON itself
+    """
+    qualities = {}
+    positions = {}
+    for position, entry in enumerate(accept.split(",")):
+        media_type, *params = entry.split(";")
+        media_type = media_type.strip().lower()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            media_type = MSGPACK_MEDIA_TYPE
+        elif media_type in WILDCARD_MEDIA_TYPES:
+            media_type = "*/*"
+        elif media_type != JSON_MEDIA_TYPE:
+            continue
+
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        qualities[media_type] = max(qualities.get(media_type, 0.0), quality)
+        positions.setdefault(media_type, position)
+
+    # An explicit JSON entry takes precedence over the wildcards
+    json_media_type = JSON_MEDIA_TYPE if JSON_MEDIA_TYPE in qualities else "*/*"
+    msgpack_quality = qualities.get(MSGPACK_MEDIA_TYPE, 0.0)
+    json_quality = qualities.get(json_media_type, 0.0)
+    if msgpack_quality > json_quality:
+        return MSGPACK_MEDIA_TYPE
+    if (
+        msgpack_quality > 0
+        and msgpack_quality == json_quality
+        and positions[MSGPACK_MEDIA_TYPE] < positions[json_media_type]
+    ):
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def negotiate_media_type(request: Request) -> str:
+    """
+    Returns the response media type requested in the Accept header
+    """
+    accept = request.headers.get("accept")
+    if accept:
+        accept = accept.lower()
+        if "msgpack" in accept:
+            return _parse_accept(accept)
+    return JSON_MEDIA_TYPE
+
+
+def serialize(content, media_type: str) -> bytes:
+    """
+    Serializes the content to bytes in the given media type
+    """
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(content, default=_msgpack_default)
+    return orjson.dumps(content)
+
+
+@lru_cache(maxsize=64)
+def static_body(message: str, media_type: str) -> bytes:
+    """
+    Returns the memoized body of a static message response
+    """
+    return serialize({"message": message}, media_type)
+
+
+def shorturl_prefix(request: Request, prefix: str) -> str:
+    """
+    Returns the public prefix of the short URLs, memoized on the raw values
+    request.base_url is built from so it is only built on a miss
+    """
+    scope = request.scope
+    server = scope.get("server")
+    key = (scope["scheme"], server and tuple(server), scope.get("root_path", ""), request.headers.get("host"), prefix)
+    short_url_prefix = _shorturl_prefixes.get(key)
+    if short_url_prefix is None:
+        # The Host header comes from the client, so keep the cache bounded
+        if len(_shorturl_prefixes) >= SHORTURL_PREFIXES_SIZE:
+            _shorturl_prefixes.clear()
+        short_url_prefix = _shorturl_prefixes[key] = f"{request.base_url}{prefix[1:]}/"
+    return short_url_prefix
+
+
+def row_to_dict(row) -> dict:
+    """
+    Converts a SQL row selected with SHORTURL_COLUMNS to a response dict
+    """
+    return row._asdict()
+
+
+def message_response(request: Request, message: str, status_code: int) -> Response:
+    """
+    Builds a static message response from the memoized bodies
+    """
+    media_type = negotiate_media_type(request)
+    return Response(content=static_body(message, media_type), status_code=status_code, media_type=media_type)
+
+
+def content_response(request: Request, content, status_code: int) -> Response:
+    """
+    Builds a response serializing the content in the negotiated media type
+    """
+    media_type = negotiate_media_type(request)
+    return Response(content=serialize(content, media_type), status_code=status_code, media_type=media_type)
@@ -0,0 +1,51 @@
+# ShortURL in-process lookup cache
+
+# Imports
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from app.utils.get_settings import get_settings
+
+
+class URLCache:
+    """
+    LRU cache of short URL ids to original URLs, shared by the worker threads
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, short_url_id: str) -> Optional[str]:
+        with self._lock:
+            url = self._data.get(short_url_id)
+            if url is not None:
+                self._data.move_to_end(short_url_id)
+            return url
+
+    def put(self, short_url_id: str, url: str):
+        self.put_many([(short_url_id, url)])
+
+    def put_many(self, items: Iterable[Tuple[str, str]]):
+        with self._lock:
+            for short_url_id, url in items:
+                self._data[short_url_id] = url
+                self._data.move_to_end(short_url_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, short_url_id: str):
+        with self._lock:
+            self._data.pop(short_url_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+url_cache = URLCache(get_settings().url_cache_size)